@@ -8,7 +8,15 @@ __version__ = "0.1.0"
 __author__ = "Yoann Diguet"
 __email__ = "yoann.diguet@example.com"
 
-from .bot import ScrabbotBot
 from .config import get_settings
 
 __all__ = ["ScrabbotBot", "get_settings"]
+
+
+def __getattr__(name):
+    """Importe ScrabbotBot (et donc telegram.ext) seulement à la demande."""
+    if name == "ScrabbotBot":
+        from .bot import ScrabbotBot
+
+        return ScrabbotBot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
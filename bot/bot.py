@@ -2,14 +2,69 @@
 Bot principal de Scrabbot.
 """
 
+import asyncio
 import logging
-from typing import Dict, Optional, Type
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from telegram import Update
+from telegram import CallbackQuery, ChatMember, Update
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes
+from telegram.request import HTTPXRequest
 
+from .cache import ChatMemberCache
 from .config import get_settings
-from .handlers import HelpHandler, StartHandler
+from .update_processor import ChatSequentialUpdateProcessor
+
+try:
+    from .utils.orjson_request import OrjsonRequest
+except ImportError:  # orjson absent : décodeur JSON standard de PTB
+    OrjsonRequest = None
+
+if TYPE_CHECKING:
+    from .handlers import Handler
+
+# Messages statiques des callbacks (arguments de edit_message_text)
+_NEWGAME_MSG = {
+    "text": "🎮 *Nouvelle partie*\n\nFonctionnalité en cours de développement...",
+    "parse_mode": "Markdown",
+}
+_RULES_MSG = {
+    "text": "📚 *Règles du jeu*\n\nFonctionnalité en cours de développement...",
+    "parse_mode": "Markdown",
+}
+_STATS_MSG = {
+    "text": "📊 *Statistiques*\n\nFonctionnalité en cours de développement...",
+    "parse_mode": "Markdown",
+}
+_SETTINGS_MSG = {
+    "text": "⚙️ *Configuration*\n\nFonctionnalité en cours de développement...",
+    "parse_mode": "Markdown",
+}
+_ERROR_TEXT = "❌ Une erreur s'est produite. Veuillez réessayer."
+_ERROR_REPLY_CONCURRENCY = 4
+_ERROR_REPLY_TTL = 10.0
+_ERROR_REPLY_CACHE_SIZE = 1024
+_POLLING_TIMEOUT = 50
+_CONCURRENT_UPDATES = 256
+_POOL_TIMEOUT = 10.0
+
+_logging_configured = False
+
+
+def _configure_logging_once() -> None:
+    """Configure le logging racine une seule fois par processus."""
+    global _logging_configured
+    if _logging_configured:
+        return
+
+    level = logging.getLevelName(get_settings().log_level.upper())
+    logging.basicConfig(
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        # getLevelName renvoie une chaîne pour un niveau inconnu
+        level=level if isinstance(level, int) else logging.INFO,
+    )
+    _logging_configured = True
 
 
 class ScrabbotBot:
@@ -17,128 +72,194 @@ class ScrabbotBot:
 
     def __init__(self):
         """Initialise le bot."""
+        # Imports locaux : `import bot.bot` ne charge pas les handlers
+        from .handlers import HelpHandler, StartHandler
+        from .handlers.help import (
+            CALLBACK_NEWGAME,
+            CALLBACK_RULES,
+            CALLBACK_SETTINGS,
+            CALLBACK_STATS,
+        )
+
         settings = get_settings()
+        # Décodage des réponses de l'API via orjson si disponible
+        request_cls = OrjsonRequest or HTTPXRequest
         self.application = (
-            Application.builder().token(settings.telegram_bot_token).build()
+            Application.builder()
+            .token(settings.telegram_bot_token)
+            # Chats différents en parallèle, mises à jour d'un même chat dans l'ordre
+            .concurrent_updates(ChatSequentialUpdateProcessor(_CONCURRENT_UPDATES))
+            # PTB exige une instance distincte pour getUpdates
+            .request(
+                request_cls(
+                    connection_pool_size=_CONCURRENT_UPDATES,
+                    pool_timeout=_POOL_TIMEOUT,
+                    # Les appels concurrents se multiplexent sur une connexion
+                    http_version="2",
+                )
+            )
+            .get_updates_request(request_cls())
+            .build()
         )
-        self.handlers: Dict[str, Type] = {
-            "start": StartHandler,
-            "help": HelpHandler,
+        # Instances partagées entre les mises à jour (les handlers sont sans état)
+        self.handlers: Dict[str, "Handler"] = {
+            handler.name: handler for handler in (StartHandler(), HelpHandler())
+        }
+        # Table de dispatch des callbacks des boutons inline
+        self._callback_dispatch = {
+            CALLBACK_NEWGAME: self._handle_newgame_callback,
+            CALLBACK_RULES: self._handle_rules_callback,
+            CALLBACK_STATS: self._handle_stats_callback,
+            CALLBACK_SETTINGS: self._handle_settings_callback,
         }
+        # Limitation des réponses d'erreur (concurrence et doublons par chat)
+        self._error_semaphore = asyncio.Semaphore(_ERROR_REPLY_CONCURRENCY)
+        self._recent_errors: "OrderedDict[Tuple[int, int], float]" = OrderedDict()
+        self._chat_members = ChatMemberCache()
         self._setup_handlers()
         self._setup_logging()
 
     def _setup_logging(self):
         """Configure le système de logging."""
-        settings = get_settings()
-        logging.basicConfig(
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            level=getattr(logging, settings.log_level.upper()),
-        )
+        _configure_logging_once()
         self.logger = logging.getLogger(__name__)
 
     def _setup_handlers(self):
         """Configure les gestionnaires de commandes."""
-        # Commandes de base
-        self.application.add_handler(CommandHandler("start", self._handle_start))
-        self.application.add_handler(CommandHandler("help", self._handle_help))
-
-        # Callbacks pour les boutons inline
-        self.application.add_handler(CallbackQueryHandler(self._handle_callback))
+        # Commandes de base et callbacks des boutons inline, enregistrés en un lot
+        handlers = [
+            CommandHandler(name, handler.handle)
+            for name, handler in self.handlers.items()
+        ]
+        handlers.append(CallbackQueryHandler(self._handle_callback))
+        self.application.add_handlers(handlers)
 
         # Gestionnaire d'erreurs
         self.application.add_error_handler(self._handle_error)
 
-    async def _handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Gère la commande /start."""
-        handler = StartHandler()
-        await handler.handle(update, context)
-
-    async def _handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Gère la commande /help."""
-        handler = HelpHandler()
-        await handler.handle(update, context)
-
     async def _handle_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
-        """Gère les callbacks des boutons inline."""
+        """
+        Gère les callbacks des boutons inline.
+
+        L'acquittement (query.answer) et le gestionnaire du bouton sont
+        attendus ensemble via asyncio.gather : les deux requêtes vers
+        l'API Telegram se superposent et la coroutine ne reprend qu'une
+        fois. Un nouveau bouton n'a qu'à s'ajouter à _callback_dispatch.
+        """
         query = update.callback_query
         if query:
-            await query.answer()
-
             # Traiter les différents types de callbacks
-            if query.data == "newgame":
-                await self._handle_newgame_callback(update, context)
-            elif query.data == "rules":
-                await self._handle_rules_callback(update, context)
-            elif query.data == "stats":
-                await self._handle_stats_callback(update, context)
-            elif query.data == "settings":
-                await self._handle_settings_callback(update, context)
+            handler = self._callback_dispatch.get(query.data)
+            if handler:
+                await asyncio.gather(
+                    self._answer_callback(query), handler(update, context)
+                )
+            else:
+                await self._answer_callback(query)
+
+    async def _answer_callback(self, query: CallbackQuery) -> None:
+        """Acquitte un callback sans propager d'erreur (n'annule pas l'édition)."""
+        try:
+            await query.answer()
+        except Exception as exc:
+            self.logger.warning("Échec de l'acquittement du callback: %s", exc)
 
     async def _handle_newgame_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
         """Gère le callback pour une nouvelle partie."""
-        await update.callback_query.edit_message_text(
-            text="🎮 *Nouvelle partie*\n\nFonctionnalité en cours de développement...",
-            parse_mode="Markdown",
-        )
+        await update.callback_query.edit_message_text(**_NEWGAME_MSG)
 
     async def _handle_rules_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
         """Gère le callback pour les règles."""
-        await update.callback_query.edit_message_text(
-            text="📚 *Règles du jeu*\n\nFonctionnalité en cours de développement...",
-            parse_mode="Markdown",
-        )
+        await update.callback_query.edit_message_text(**_RULES_MSG)
 
     async def _handle_stats_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
         """Gère le callback pour les statistiques."""
-        await update.callback_query.edit_message_text(
-            text="📊 *Statistiques*\n\nFonctionnalité en cours de développement...",
-            parse_mode="Markdown",
-        )
+        await update.callback_query.edit_message_text(**_STATS_MSG)
 
     async def _handle_settings_callback(
         self, update: Update, context: ContextTypes.DEFAULT_TYPE
     ):
         """Gère le callback pour les paramètres."""
-        await update.callback_query.edit_message_text(
-            text="⚙️ *Configuration*\n\nFonctionnalité en cours de développement...",
-            parse_mode="Markdown",
-        )
+        await update.callback_query.edit_message_text(**_SETTINGS_MSG)
 
     async def _handle_error(
         self, update: Optional[Update], context: ContextTypes.DEFAULT_TYPE
     ):
         """Gère les erreurs du bot."""
         err_text = str(getattr(context, "error", ""))
-        self.logger.error(f"Exception while handling an update: {err_text}")
+        self.logger.error("Exception while handling an update: %s", err_text)
 
         # Ne pas répondre au chat pour les erreurs globales ou conflits de polling
         if not update or "Conflict: terminated by other getUpdates request" in err_text:
             return
 
-        if update.effective_chat:
+        if update.effective_chat and self._should_reply_error(
+            update.effective_chat.id, err_text
+        ):
             try:
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text="❌ Une erreur s'est produite. Veuillez réessayer.",
-                )
+                # Borne le nombre de réponses d'erreur simultanées
+                async with self._error_semaphore:
+                    await context.bot.send_message(
+                        chat_id=update.effective_chat.id,
+                        text=_ERROR_TEXT,
+                    )
             except Exception:
                 # Évite une boucle d'erreurs si l'envoi échoue
                 pass
 
+    def _should_reply_error(self, chat_id: int, err_text: str) -> bool:
+        """
+        Indique s'il faut répondre à une erreur dans un chat.
+
+        Une même erreur n'est signalée qu'une fois par chat pendant
+        _ERROR_REPLY_TTL secondes, pour éviter qu'une rafale d'erreurs
+        ne génère une rafale de messages (et de nouvelles erreurs 429).
+        """
+        now = time.monotonic()
+        key = (chat_id, hash(err_text))
+        last_sent = self._recent_errors.get(key)
+        if last_sent is not None and now - last_sent < _ERROR_REPLY_TTL:
+            return False
+
+        self._recent_errors[key] = now
+        self._recent_errors.move_to_end(key)
+        if len(self._recent_errors) > _ERROR_REPLY_CACHE_SIZE:
+            self._recent_errors.popitem(last=False)
+        return True
+
+    async def get_chat_member(self, chat_id: int, user_id: int) -> ChatMember:
+        """
+        Récupère un membre de chat via le cache (15 min) plutôt que l'API.
+
+        Args:
+            chat_id: Identifiant du chat
+            user_id: Identifiant de l'utilisateur
+
+        Returns:
+            Membre du chat
+        """
+        return await self._chat_members.get_chat_member(
+            self.application.bot, chat_id, user_id
+        )
+
     def start_polling(self) -> None:
         """Démarre le bot en mode polling (bloquant)."""
         self.logger.info("Démarrage du bot Scrabbot (polling)...")
-        # Méthode bloquante et non asynchrone en PTB 20+
-        self.application.run_polling()
+        # Méthode bloquante et non asynchrone en PTB 20+.
+        # Long polling maximal (50 s) : une seule requête getUpdates tant que
+        # le bot est inactif. Sans effet en mode webhook (prefer_webhook).
+        self.application.run_polling(
+            poll_interval=0.0,
+            timeout=_POLLING_TIMEOUT,
+        )
 
     def start_webhook(self) -> None:
         """Démarre le bot en mode webhook (bloquant)."""
@@ -149,27 +270,41 @@ class ScrabbotBot:
             )
 
         self.logger.info("Démarrage du bot Scrabbot (webhook)...")
-        # Méthode bloquante et non asynchrone en PTB 20+
+        # Méthode bloquante et non asynchrone en PTB 20+.
+        # TELEGRAM_WEBHOOK_URL est l'URL complète enregistrée auprès de
+        # Telegram ; WEBHOOK_PATH est le chemin servi localement derrière
+        # le reverse proxy.
         self.application.run_webhook(
-            listen="0.0.0.0",
-            port=get_settings().api_port,
-            webhook_url=get_settings().telegram_webhook_url,
+            listen=settings.api_host,
+            port=settings.api_port,
+            url_path=settings.webhook_path.strip("/"),
+            secret_token=settings.webhook_secret_token,
+            webhook_url=settings.telegram_webhook_url,
         )
 
 
 def main() -> None:
     """Fonction principale pour démarrer le bot (bloquante)."""
+    # uvloop (optionnel) doit être installé avant la construction de l'Application
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     settings = get_settings()
     bot = ScrabbotBot()
     try:
-        if settings.telegram_webhook_url:
+        if settings.prefer_webhook and settings.telegram_webhook_url:
             bot.start_webhook()
         else:
+            # Repli pour le développement local (pas d'URL publique)
             bot.start_polling()
     except KeyboardInterrupt:
         logging.info("Arrêt demandé par l'utilisateur.")
     except Exception as e:
-        logging.error(f"Erreur lors du démarrage du bot: {e}")
+        logging.error("Erreur lors du démarrage du bot: %s", e)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Caches en mémoire pour limiter les appels à l'API Telegram.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from telegram import Bot, ChatMember
+
+
+class ChatMemberCache:
+    """Cache LRU avec expiration des résultats de getChatMember."""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 900.0):
+        """
+        Initialise le cache.
+
+        Args:
+            maxsize: Nombre maximal d'entrées conservées
+            ttl: Durée de validité d'une entrée, en secondes
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[float, ChatMember]]" = (
+            OrderedDict()
+        )
+
+    async def get_chat_member(self, bot: Bot, chat_id: int, user_id: int) -> ChatMember:
+        """
+        Retourne le membre du chat, en interrogeant Telegram si nécessaire.
+
+        Args:
+            bot: Bot utilisé pour l'appel à l'API
+            chat_id: Identifiant du chat
+            user_id: Identifiant de l'utilisateur
+
+        Returns:
+            Membre du chat
+        """
+        key = (chat_id, user_id)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        member = await bot.get_chat_member(chat_id=chat_id, user_id=user_id)
+        self._entries[key] = (now, member)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return member
+
+    def invalidate(self, chat_id: int, user_id: int) -> None:
+        """Oublie l'entrée d'un membre (ex: après un changement de statut)."""
+        self._entries.pop((chat_id, user_id), None)
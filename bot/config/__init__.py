@@ -5,11 +5,19 @@ Expose un constructeur paresseux pour éviter l'initialisation
 des variables d'environnement au moment de l'import (utile en tests).
 """
 
+from functools import lru_cache
+
 from .settings import Settings
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Retourne une instance de paramètres fraîchement initialisée."""
+    """
+    Retourne l'instance de paramètres, construite au premier appel.
+
+    Appeler ``get_settings.cache_clear()`` après avoir modifié
+    l'environnement pour forcer une relecture.
+    """
     return Settings()
 
 
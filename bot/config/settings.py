@@ -16,6 +16,15 @@ class Settings(BaseSettings):
     telegram_webhook_url: Optional[str] = Field(
         None, description="URL du webhook Telegram"
     )
+    prefer_webhook: bool = Field(
+        True, description="Utiliser le webhook plutôt que le polling si possible"
+    )
+    webhook_path: str = Field(
+        "", description="Chemin local servi par le webhook (vide = racine)"
+    )
+    webhook_secret_token: Optional[str] = Field(
+        None, description="Jeton secret vérifié sur chaque requête du webhook"
+    )
 
     # Configuration de la base de données
     database_url: str = Field(
@@ -2,8 +2,8 @@
 Gestionnaires de commandes du bot Telegram.
 """
 
-from .base import BaseHandler
+from .base import BaseHandler, Handler
 from .help import HelpHandler
 from .start import StartHandler
 
-__all__ = ["BaseHandler", "StartHandler", "HelpHandler"]
+__all__ = ["BaseHandler", "Handler", "StartHandler", "HelpHandler"]
@@ -7,20 +7,14 @@ from telegram.ext import ContextTypes
 
 from .base import BaseHandler
 
+# Données des callbacks des boutons inline (partagées avec le dispatch du bot)
+CALLBACK_NEWGAME = "newgame"
+CALLBACK_RULES = "rules"
+CALLBACK_STATS = "stats"
+CALLBACK_SETTINGS = "settings"
 
-class HelpHandler(BaseHandler):
-    """Gestionnaire pour la commande /help."""
-
-    async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """
-        Traite la commande /help.
 
-        Args:
-            update: Mise à jour Telegram
-            context: Contexte de la mise à jour
-        """
-        help_message = """
-📚 *Commandes disponibles :*
+_HELP_TEXT = """📚 *Commandes disponibles :*
 
 *🎮 Commandes de jeu :*
 • /newgame - Créer une nouvelle partie
@@ -45,26 +39,40 @@ class HelpHandler(BaseHandler):
 • `/play CHAT H8` - Placer "CHAT" en H8
 • `/exchange QZ` - Échanger Q et Z
 
-*Besoin d'aide ?* Contactez @support
-        """.strip()
-
-        # Créer des boutons inline pour les actions rapides
-        keyboard = [
-            [
-                InlineKeyboardButton("🎮 Nouvelle partie", callback_data="newgame"),
-                InlineKeyboardButton("📚 Règles", callback_data="rules"),
-            ],
-            [
-                InlineKeyboardButton("📊 Statistiques", callback_data="stats"),
-                InlineKeyboardButton("⚙️ Configuration", callback_data="settings"),
-            ],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+*Besoin d'aide ?* Contactez @support"""
+
+# Boutons inline pour les actions rapides
+_HELP_MARKUP = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("🎮 Nouvelle partie", callback_data=CALLBACK_NEWGAME),
+            InlineKeyboardButton("📚 Règles", callback_data=CALLBACK_RULES),
+        ],
+        [
+            InlineKeyboardButton("📊 Statistiques", callback_data=CALLBACK_STATS),
+            InlineKeyboardButton("⚙️ Configuration", callback_data=CALLBACK_SETTINGS),
+        ],
+    ]
+)
+
 
+class HelpHandler(BaseHandler):
+    """Gestionnaire pour la commande /help."""
+
+    name = "help"
+
+    async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Traite la commande /help.
+
+        Args:
+            update: Mise à jour Telegram
+            context: Contexte de la mise à jour
+        """
         await self.send_message(
             update=update,
             context=context,
-            text=help_message,
+            text=_HELP_TEXT,
             parse_mode="Markdown",
-            reply_markup=reply_markup,
+            reply_markup=_HELP_MARKUP,
         )
@@ -2,31 +2,30 @@
 Gestionnaire pour la commande /start.
 """
 
+import asyncio
+import time
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update, WebAppInfo
 from telegram.ext import ContextTypes
+from telegram.helpers import escape_markdown
 
-from ..config import get_settings
+from ..config import Settings, get_settings
 from ..utils.godot_launcher import launch_godot_project
 from .base import BaseHandler
 
+_MINIAPP_SUFFIX = "\n\nAstuce: utilisez le bouton ‘Mini App’ pour le plein écran."
+_LAUNCHED_SUFFIX = "\n\n🖥️ Lancement de l'interface Godot..."
+_RECENTLY_LAUNCHED_SUFFIX = "\n\n🖥️ L'interface Godot a déjà été lancée récemment."
+_NOT_LAUNCHED_SUFFIX = "\n\n⚠️ Godot n'a pas pu être lancé automatiquement."
 
-class StartHandler(BaseHandler):
-    """Gestionnaire pour la commande /start."""
+# Délai minimal entre deux lancements de Godot pour un même chat (secondes)
+_GODOT_LAUNCH_COOLDOWN = 60.0
 
-    async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """
-        Traite la commande /start.
+# Message de bienvenue, découpé une fois autour du prénom du joueur
+_WELCOME_PRE, _WELCOME_POST = """🎲 *Bienvenue dans Scrabbot !*
 
-        Args:
-            update: Mise à jour Telegram
-            context: Contexte de la mise à jour
-        """
-        user_info = self.get_user_info(update)
-
-        welcome_message = f"""
-🎲 *Bienvenue dans Scrabbot !*
-
-Bonjour {user_info.get('first_name', 'Joueur')} !
+Bonjour {first_name} !
 
 Je suis votre partenaire de jeu de Scrabble intelligent.
 Avec moi, vous pouvez :
@@ -38,47 +37,120 @@ Avec moi, vous pouvez :
 
 Utilisez /help pour voir toutes les commandes disponibles.
 
-*Bon jeu !* 🎯
-        """.strip()
+*Bon jeu !* 🎯""".split("{first_name}")
+
+
+@lru_cache(maxsize=4)
+def _miniapp_markup(web_url: str) -> InlineKeyboardMarkup:
+    """Boutons d'ouverture de la Mini App, construits une fois par URL."""
+    # Ajoute des boutons pour ouvrir la Mini App (plein écran) et un fallback navigateur
+    return InlineKeyboardMarkup(
+        [
+            [
+                InlineKeyboardButton(
+                    "🎮 Ouvrir en plein écran (Mini App)",
+                    web_app=WebAppInfo(url=web_url),
+                )
+            ],
+            [
+                InlineKeyboardButton(
+                    "🌐 Ouvrir dans le navigateur",
+                    url=web_url,
+                )
+            ],
+        ]
+    )
+
+
+class StartHandler(BaseHandler):
+    """Gestionnaire pour la commande /start."""
+
+    name = "start"
 
-        # Lancer la scène Godot (jeu) côté local (desktop)
+    async def handle(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """
+        Traite la commande /start.
+
+        Args:
+            update: Mise à jour Telegram
+            context: Contexte de la mise à jour
+        """
+        user = update.effective_user
+        # Échappe le prénom : un _ ou un * casserait le Markdown du message
+        first_name = escape_markdown(user.first_name) if user else "Joueur"
+        welcome_message = _WELCOME_PRE + first_name + _WELCOME_POST
+
+        # Lancer la scène Godot (jeu) côté local (desktop), en tâche de fond :
+        # avec la Mini App, le message n'en dépend pas et part sans l'attendre
         settings = get_settings()
-        launched = False
+        launch = None
         if settings.godot_executable_path:
-            launched = launch_godot_project(
-                executable_path=settings.godot_executable_path,
-                project_dir=settings.godot_project_path,
+            launch = asyncio.create_task(
+                self._launch_godot_debounced(update, context, settings)
             )
 
-        suffix = ""
+        suffix = _NOT_LAUNCHED_SUFFIX
         reply_markup = None
         if settings.godot_web_url:
-            # Ajoute des boutons pour ouvrir la Mini App (plein écran) et un fallback navigateur
-            reply_markup = InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton(
-                            "🎮 Ouvrir en plein écran (Mini App)",
-                            web_app=WebAppInfo(url=settings.godot_web_url),
-                        )
-                    ],
-                    [
-                        InlineKeyboardButton(
-                            "🌐 Ouvrir dans le navigateur",
-                            url=settings.godot_web_url,
-                        )
-                    ],
-                ]
+            reply_markup = _miniapp_markup(settings.godot_web_url)
+            suffix = _MINIAPP_SUFFIX
+        elif launch is not None:
+            suffix = await launch
+
+        try:
+            await self.send_message(
+                update=update,
+                context=context,
+                text=welcome_message + suffix,
+                parse_mode="Markdown",
+                reply_markup=reply_markup,
             )
-            suffix = "\n\nAstuce: utilisez le bouton ‘Mini App’ pour le plein écran."
-        elif launched:
-            suffix = "\n\n🖥️ Lancement de l'interface Godot..."
-
-        await self.send_message(
-            update=update,
-            context=context,
-            text=welcome_message
-            + (suffix or "\n\n⚠️ Godot n'a pas pu être lancé automatiquement."),
-            parse_mode="Markdown",
-            reply_markup=reply_markup,
+        finally:
+            if launch is not None:
+                await launch
+
+    async def _launch_godot_debounced(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, settings: Settings
+    ) -> str:
+        """
+        Lance Godot au plus une fois par chat toutes les _GODOT_LAUNCH_COOLDOWN s.
+
+        Évite qu'une rafale de /start ne démarre autant de processus Godot.
+        Une mise à jour sans chat lance Godot sans délai anti-rafale.
+
+        Returns:
+            Suffixe du message de bienvenue décrivant le lancement
+        """
+        chat = update.effective_chat
+        if chat is None:
+            return await self._launch_godot(settings)
+
+        last_launches = context.bot_data.setdefault("_godot_last_launch", {})
+        now = time.monotonic()
+        last = last_launches.get(chat.id)
+        if last is not None and now - last < _GODOT_LAUNCH_COOLDOWN:
+            return _RECENTLY_LAUNCHED_SUFFIX
+
+        # Oublie les chats dont le délai est écoulé (le dict ne grossit pas)
+        for chat_id in [
+            chat_id
+            for chat_id, launched_at in last_launches.items()
+            if now - launched_at >= _GODOT_LAUNCH_COOLDOWN
+        ]:
+            del last_launches[chat_id]
+        # Réservé avant l'attente : un /start concurrent ne relance pas Godot
+        last_launches[chat.id] = now
+        suffix = await self._launch_godot(settings)
+        if suffix == _NOT_LAUNCHED_SUFFIX:
+            last_launches.pop(chat.id, None)
+        return suffix
+
+    async def _launch_godot(self, settings: Settings) -> str:
+        """Lance Godot et retourne le suffixe correspondant au résultat."""
+        # Popen dans un thread pour ne pas retenir la boucle pendant le spawn
+        launched = await asyncio.to_thread(
+            launch_godot_project,
+            executable_path=settings.godot_executable_path,
+            project_dir=settings.godot_project_path,
         )
+        return _LAUNCHED_SUFFIX if launched else _NOT_LAUNCHED_SUFFIX
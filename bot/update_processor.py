@@ -0,0 +1,66 @@
+"""
+Traitement concurrent des mises à jour, séquentiel par chat.
+"""
+
+import asyncio
+from typing import Awaitable, Dict, Tuple
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+class ChatSequentialUpdateProcessor(BaseUpdateProcessor):
+    """
+    Traite les mises à jour de chats différents en parallèle.
+
+    Les mises à jour d'un même chat passent une à une, dans leur ordre
+    d'arrivée : deux appuis rapides sur un bouton ou deux coups joués à
+    la suite ne s'entrelacent pas. Les mises à jour sans chat ne sont
+    pas sérialisées.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        """
+        Initialise le processeur.
+
+        Args:
+            max_concurrent_updates: Nombre maximal de mises à jour simultanées
+        """
+        super().__init__(max_concurrent_updates)
+        # Verrou et nombre de mises à jour en cours ou en attente, par chat
+        self._chat_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
+
+    async def do_process_update(self, update: object, coroutine: Awaitable) -> None:
+        """
+        Traite une mise à jour après celles déjà reçues pour le même chat.
+
+        Args:
+            update: Mise à jour reçue
+            coroutine: Traitement de la mise à jour par l'application
+        """
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await coroutine
+            return
+
+        lock, pending = self._chat_locks.get(chat.id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._chat_locks[chat.id] = (lock, pending + 1)
+        try:
+            # asyncio.Lock réveille les attentes dans l'ordre d'arrivée
+            async with lock:
+                await coroutine
+        finally:
+            lock, pending = self._chat_locks[chat.id]
+            if pending == 1:
+                # Dernière mise à jour du chat : le verrou n'est plus utile
+                del self._chat_locks[chat.id]
+            else:
+                self._chat_locks[chat.id] = (lock, pending - 1)
+
+    async def initialize(self) -> None:
+        """Aucune ressource à initialiser."""
+
+    async def shutdown(self) -> None:
+        """Aucune ressource à libérer."""
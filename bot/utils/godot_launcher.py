@@ -2,19 +2,23 @@
 Utilitaire pour lancer le projet Godot localement.
 """
 
+import asyncio
 import logging
 import os
+import shutil
 import subprocess
+from functools import lru_cache
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
 def _resolve_executable(explicit_path: Optional[str]) -> str:
-    if explicit_path:
-        return explicit_path
     # Fallbacks courants
-    return "godot4"
+    exe = explicit_path or "godot4"
+    # Recherche dans le PATH une seule fois (Popen la referait à chaque lancement)
+    return shutil.which(exe) or exe
 
 
 def launch_godot_project(executable_path: Optional[str], project_dir: str) -> bool:
@@ -23,12 +27,16 @@ def launch_godot_project(executable_path: Optional[str], project_dir: str) -> bo
     try:
         # Godot 4: lancer le jeu (pas l'éditeur) avec --path
         cmd = [exe, "--path", project_dir]
-        logger.info(f"Lancement de Godot: {' '.join(cmd)}")
-        # Démarrage détaché, sans bloquer le bot
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Lancement de Godot: %s", " ".join(cmd))
+        # Démarrage détaché, sans bloquer le bot.
+        # close_fds=False permet à CPython d'utiliser posix_spawn (chemin
+        # absolu résolu) ; les descripteurs du bot restent non héritables.
         subprocess.Popen(
             cmd,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
+            close_fds=False,
             creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
         )
         return True
@@ -38,17 +46,23 @@ def launch_godot_project(executable_path: Optional[str], project_dir: str) -> bo
         )
         return False
     except Exception as exc:
-        logger.error(f"Échec du lancement Godot: {exc}")
+        logger.error("Échec du lancement Godot: %s", exc)
         return False
 
 
-def export_godot_project(
+async def export_godot_project(
     executable_path: Optional[str],
     project_dir: str,
     preset: str,
     export_path: str,
+    timeout: Optional[float] = None,
 ) -> bool:
-    """Exporte le projet Godot en mode headless pour un preset donné."""
+    """
+    Exporte le projet Godot en mode headless pour un preset donné.
+
+    L'export peut durer plusieurs minutes : le processus est attendu de
+    façon asynchrone pour ne pas bloquer la boucle d'événements du bot.
+    """
     exe = _resolve_executable(executable_path)
     try:
         os.makedirs(os.path.dirname(export_path), exist_ok=True)
@@ -61,17 +75,30 @@ def export_godot_project(
             preset,
             export_path,
         ]
-        logger.info(f"Export Godot: {' '.join(cmd)}")
-        subprocess.check_call(cmd)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Export Godot: %s", " ".join(cmd))
+        proc = await asyncio.create_subprocess_exec(*cmd)
+        try:
+            returncode = await asyncio.wait_for(proc.wait(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.error("Export Godot interrompu après %s s.", timeout)
+            return False
+        except asyncio.CancelledError:
+            # Ne pas laisser l'export tourner sans personne pour l'attendre
+            proc.kill()
+            await proc.wait()
+            raise
+        if returncode != 0:
+            logger.error("Échec export Godot (code %s).", returncode)
+            return False
         return True
     except FileNotFoundError:
         logger.error(
             "Godot introuvable. Définissez GODOT_EXECUTABLE_PATH dans .env (ex: C:/Program Files/Godot/Godot_v4.4/godot4.exe)."
         )
         return False
-    except subprocess.CalledProcessError as exc:
-        logger.error(f"Échec export Godot (code {exc.returncode}).")
-        return False
     except Exception as exc:
-        logger.error(f"Échec export Godot: {exc}")
+        logger.error("Échec export Godot: %s", exc)
         return False
@@ -0,0 +1,38 @@
+"""
+Requête HTTP PTB décodant les réponses de l'API Telegram avec orjson.
+"""
+
+import orjson
+from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
+
+
+class OrjsonRequest(HTTPXRequest):
+    """
+    HTTPXRequest dont le décodage JSON des réponses utilise orjson.
+
+    Seules les réponses aux appels de l'API Bot (y compris getUpdates en
+    mode polling) passent par ce décodeur. En mode webhook, les mises à
+    jour reçues sont décodées par le serveur tornado de PTB avec le json
+    standard, sans point d'extension public : elles ne sont pas couvertes.
+    """
+
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        """
+        Décode la réponse JSON de l'API Telegram.
+
+        Args:
+            payload: Corps brut de la réponse
+
+        Returns:
+            Réponse décodée
+        """
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Même tolérance que PTB pour un UTF-8 invalide
+            try:
+                return orjson.loads(payload.decode("utf-8", "replace"))
+            except orjson.JSONDecodeError as exc:
+                raise TelegramError("Invalid server response") from exc
@@ -2,14 +2,30 @@
 Tests pour le bot Scrabbot.
 """
 
+import asyncio
+import time
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from telegram import Update, User, Chat
+from telegram.error import TelegramError
 from telegram.ext import ContextTypes
 
-from bot.bot import ScrabbotBot
-from bot.handlers.start import StartHandler
-from bot.handlers.help import HelpHandler
+import bot.bot
+from bot.bot import ScrabbotBot, main
+from bot.cache import ChatMemberCache
+from bot.config import get_settings
+from bot.handlers.start import _RECENTLY_LAUNCHED_SUFFIX, StartHandler
+from bot.handlers.help import (
+    CALLBACK_NEWGAME,
+    CALLBACK_RULES,
+    CALLBACK_SETTINGS,
+    CALLBACK_STATS,
+    HelpHandler,
+)
+from bot.update_processor import ChatSequentialUpdateProcessor
+from bot.utils.godot_launcher import export_godot_project
+from bot.utils.orjson_request import OrjsonRequest
 
 
 class TestScrabbotBot:
@@ -24,12 +40,251 @@ class TestScrabbotBot:
             m.setenv("API_SECRET_KEY", "test_secret")
             # Désactive tout webhook pour les tests
             m.delenv("TELEGRAM_WEBHOOK_URL", raising=False)
+            get_settings.cache_clear()
 
             bot = ScrabbotBot()
             assert bot is not None
             assert hasattr(bot, 'application')
             assert hasattr(bot, 'handlers')
 
+    def test_start_webhook_arguments(self, monkeypatch):
+        """Test les arguments transmis à run_webhook."""
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123456789:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef123")
+        monkeypatch.setenv("TELEGRAM_WEBHOOK_URL", "https://example.com/webhook")
+        monkeypatch.setenv("API_HOST", "127.0.0.1")
+        monkeypatch.setenv("API_PORT", "8443")
+        monkeypatch.setenv("WEBHOOK_PATH", "/webhook/")
+        monkeypatch.setenv("WEBHOOK_SECRET_TOKEN", "secret")
+        get_settings.cache_clear()
+
+        bot = ScrabbotBot()
+        bot.application = MagicMock()
+        bot.start_webhook()
+
+        # L'URL enregistrée auprès de Telegram est transmise telle quelle
+        bot.application.run_webhook.assert_called_once_with(
+            listen="127.0.0.1",
+            port=8443,
+            url_path="webhook",
+            secret_token="secret",
+            webhook_url="https://example.com/webhook",
+        )
+
+    def test_start_webhook_default_path(self, monkeypatch):
+        """Test que le webhook écoute à la racine par défaut."""
+        monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123456789:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef123")
+        monkeypatch.setenv("TELEGRAM_WEBHOOK_URL", "https://example.com/webhook")
+        monkeypatch.delenv("WEBHOOK_PATH", raising=False)
+        get_settings.cache_clear()
+
+        bot = ScrabbotBot()
+        bot.application = MagicMock()
+        bot.start_webhook()
+
+        kwargs = bot.application.run_webhook.call_args.kwargs
+        assert kwargs["url_path"] == ""
+        assert kwargs["webhook_url"] == "https://example.com/webhook"
+
+    @pytest.mark.parametrize(
+        "prefer_webhook, webhook_url, expected",
+        [
+            ("True", "https://example.com/webhook", "start_webhook"),
+            ("False", "https://example.com/webhook", "start_polling"),
+            ("True", None, "start_polling"),
+        ],
+    )
+    def test_main_transport_choice(self, monkeypatch, prefer_webhook, webhook_url, expected):
+        """Test le choix entre webhook et polling dans main()."""
+        monkeypatch.setenv("PREFER_WEBHOOK", prefer_webhook)
+        if webhook_url:
+            monkeypatch.setenv("TELEGRAM_WEBHOOK_URL", webhook_url)
+        else:
+            monkeypatch.delenv("TELEGRAM_WEBHOOK_URL", raising=False)
+        get_settings.cache_clear()
+        # N'installe pas de politique de boucle globale pendant les tests
+        monkeypatch.setattr("asyncio.set_event_loop_policy", lambda policy: None)
+        bot_cls = MagicMock()
+        monkeypatch.setattr(bot.bot, "ScrabbotBot", bot_cls)
+
+        main()
+
+        instance = bot_cls.return_value
+        for method in ("start_webhook", "start_polling"):
+            assert getattr(instance, method).called == (method == expected)
+
+
+@pytest.fixture
+def scrabbot(monkeypatch):
+    """Bot construit avec un jeton factice et sans webhook."""
+    monkeypatch.setenv("TELEGRAM_BOT_TOKEN", "123456789:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdef123")
+    monkeypatch.delenv("TELEGRAM_WEBHOOK_URL", raising=False)
+    get_settings.cache_clear()
+    return ScrabbotBot()
+
+
+class TestChatSequentialUpdateProcessor:
+    """Tests pour le traitement séquentiel par chat."""
+
+    @staticmethod
+    def _update(chat_id):
+        """Mise à jour factice d'un chat donné."""
+        update = MagicMock(spec=Update)
+        update.effective_chat = MagicMock(spec=Chat)
+        update.effective_chat.id = chat_id
+        return update
+
+    async def _run_pair(self, first_chat, second_chat):
+        """Traite deux mises à jour, la première restant bloquée au départ."""
+        processor = ChatSequentialUpdateProcessor(8)
+        release = asyncio.Event()
+        events = []
+
+        async def first():
+            events.append("first start")
+            await release.wait()
+            events.append("first end")
+
+        async def second():
+            events.append("second")
+
+        tasks = [
+            asyncio.create_task(
+                processor.do_process_update(self._update(first_chat), first())
+            ),
+            asyncio.create_task(
+                processor.do_process_update(self._update(second_chat), second())
+            ),
+        ]
+        await asyncio.sleep(0)
+        started = list(events)
+        release.set()
+        await asyncio.gather(*tasks)
+        return started, events, processor
+
+    @pytest.mark.asyncio
+    async def test_same_chat_sequential(self):
+        """Test que les mises à jour d'un même chat sont traitées dans l'ordre."""
+        started, events, processor = await self._run_pair(1, 1)
+
+        assert started == ["first start"]
+        assert events == ["first start", "first end", "second"]
+        # Les verrous des chats inactifs sont libérés
+        assert processor._chat_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_other_chats_parallel(self):
+        """Test qu'un chat occupé ne retarde pas les autres chats."""
+        started, events, _ = await self._run_pair(1, 2)
+
+        assert started == ["first start", "second"]
+        assert events == ["first start", "second", "first end"]
+
+
+class TestErrorReplies:
+    """Tests pour la limitation des réponses d'erreur."""
+
+    def test_same_error_same_chat_suppressed(self, scrabbot, monkeypatch):
+        """Test qu'une même erreur dans un même chat n'est signalée qu'une fois en 10 s."""
+        clock = [100.0]
+        monkeypatch.setattr(bot.bot.time, "monotonic", lambda: clock[0])
+
+        assert scrabbot._should_reply_error(1, "boom")
+        clock[0] += 5
+        assert not scrabbot._should_reply_error(1, "boom")
+        clock[0] += 6
+        assert scrabbot._should_reply_error(1, "boom")
+
+    def test_other_chat_or_error_replied(self, scrabbot):
+        """Test qu'un autre chat ou une autre erreur obtient une réponse."""
+        assert scrabbot._should_reply_error(1, "boom")
+        assert scrabbot._should_reply_error(2, "boom")
+        assert scrabbot._should_reply_error(1, "autre")
+
+    def test_cache_eviction(self, scrabbot, monkeypatch):
+        """Test l'éviction des entrées au-delà de _ERROR_REPLY_CACHE_SIZE."""
+        monkeypatch.setattr(bot.bot, "_ERROR_REPLY_CACHE_SIZE", 2)
+
+        for chat_id in (1, 2, 3):
+            assert scrabbot._should_reply_error(chat_id, "boom")
+
+        assert len(scrabbot._recent_errors) == 2
+        # Le chat 1, le plus ancien, a été évincé : l'erreur est de nouveau signalée
+        assert scrabbot._should_reply_error(1, "boom")
+        assert not scrabbot._should_reply_error(3, "boom")
+
+    @pytest.mark.asyncio
+    async def test_handle_error_replies_once(self, scrabbot):
+        """Test que _handle_error n'envoie qu'une réponse pour une erreur répétée."""
+        update = MagicMock(spec=Update)
+        update.effective_chat = MagicMock(spec=Chat)
+        update.effective_chat.id = 123456
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+        context.error = RuntimeError("boom")
+        context.bot.send_message = AsyncMock()
+
+        await scrabbot._handle_error(update, context)
+        await scrabbot._handle_error(update, context)
+
+        context.bot.send_message.assert_called_once()
+
+
+class TestCallbacks:
+    """Tests pour les callbacks des boutons inline."""
+
+    @staticmethod
+    def _callback_update(data):
+        """Mise à jour factice portant un callback."""
+        update = MagicMock(spec=Update)
+        update.callback_query = MagicMock()
+        update.callback_query.data = data
+        update.callback_query.answer = AsyncMock()
+        update.callback_query.edit_message_text = AsyncMock()
+        return update
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "data, message",
+        [
+            (CALLBACK_NEWGAME, bot.bot._NEWGAME_MSG),
+            (CALLBACK_RULES, bot.bot._RULES_MSG),
+            (CALLBACK_STATS, bot.bot._STATS_MSG),
+            (CALLBACK_SETTINGS, bot.bot._SETTINGS_MSG),
+        ],
+    )
+    async def test_callback_edits_message(self, scrabbot, data, message):
+        """Test que chaque bouton acquitte et édite le message attendu."""
+        update = self._callback_update(data)
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+
+        await scrabbot._handle_callback(update, context)
+
+        update.callback_query.answer.assert_called_once_with()
+        update.callback_query.edit_message_text.assert_called_once_with(**message)
+
+    @pytest.mark.asyncio
+    async def test_unknown_callback_only_answered(self, scrabbot):
+        """Test qu'un callback inconnu est seulement acquitté."""
+        update = self._callback_update("inconnu")
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+
+        await scrabbot._handle_callback(update, context)
+
+        update.callback_query.answer.assert_called_once_with()
+        update.callback_query.edit_message_text.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_answer_failure_does_not_stop_edit(self, scrabbot):
+        """Test qu'un échec de l'acquittement n'empêche pas l'édition."""
+        update = self._callback_update(CALLBACK_RULES)
+        update.callback_query.answer.side_effect = TelegramError("Query is too old")
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+
+        await scrabbot._handle_callback(update, context)
+
+        update.callback_query.edit_message_text.assert_called_once_with(
+            **bot.bot._RULES_MSG
+        )
+
 
 class TestStartHandler:
     """Tests pour le gestionnaire StartHandler."""
@@ -55,6 +310,94 @@ class TestStartHandler:
         # Vérifier que send_message a été appelé
         context.bot.send_message.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_handle_start_escapes_first_name(self, monkeypatch):
+        """Test que le prénom est échappé pour le Markdown."""
+        monkeypatch.delenv("GODOT_EXECUTABLE_PATH", raising=False)
+        get_settings.cache_clear()
+        update = MagicMock(spec=Update)
+        update.effective_user = MagicMock(spec=User)
+        update.effective_user.first_name = "a_b*c"
+        update.effective_chat = MagicMock(spec=Chat)
+        update.effective_chat.id = 123456
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+        context.bot.send_message = AsyncMock()
+
+        await StartHandler().handle(update, context)
+
+        text = context.bot.send_message.call_args.kwargs["text"]
+        assert "a\\_b\\*c" in text
+
+    @staticmethod
+    def _godot_start(monkeypatch, launched):
+        """Prépare un /start avec Godot configuré et un lancement simulé."""
+        monkeypatch.setenv("GODOT_EXECUTABLE_PATH", "/usr/bin/godot4")
+        monkeypatch.delenv("GODOT_WEB_URL", raising=False)
+        get_settings.cache_clear()
+        launch = MagicMock(return_value=launched)
+        monkeypatch.setattr("bot.handlers.start.launch_godot_project", launch)
+
+        update = MagicMock(spec=Update)
+        update.effective_user = MagicMock(spec=User)
+        update.effective_user.first_name = "Test"
+        update.effective_chat = MagicMock(spec=Chat)
+        update.effective_chat.id = 123456
+        context = MagicMock(spec=ContextTypes.DEFAULT_TYPE)
+        context.bot_data = {}
+        context.bot.send_message = AsyncMock()
+        return launch, update, context
+
+    @pytest.mark.asyncio
+    async def test_godot_launch_debounced(self, monkeypatch):
+        """Test que deux /start en moins de 60 s ne lancent Godot qu'une fois."""
+        launch, update, context = self._godot_start(monkeypatch, launched=True)
+        handler = StartHandler()
+
+        await handler.handle(update, context)
+        await handler.handle(update, context)
+
+        launch.assert_called_once()
+        assert context.bot.send_message.call_count == 2
+        assert 123456 in context.bot_data["_godot_last_launch"]
+        # Le second message n'annonce pas un nouveau lancement
+        text = context.bot.send_message.call_args.kwargs["text"]
+        assert text.endswith(_RECENTLY_LAUNCHED_SUFFIX)
+
+    @pytest.mark.asyncio
+    async def test_godot_expired_launches_pruned(self, monkeypatch):
+        """Test que les lancements dont le délai est écoulé sont oubliés."""
+        launch, update, context = self._godot_start(monkeypatch, launched=True)
+        context.bot_data["_godot_last_launch"] = {999: time.monotonic() - 120}
+
+        await StartHandler().handle(update, context)
+
+        assert list(context.bot_data["_godot_last_launch"]) == [123456]
+
+    @pytest.mark.asyncio
+    async def test_godot_launch_without_chat_not_debounced(self, monkeypatch):
+        """Test qu'une mise à jour sans chat n'utilise pas le délai anti-rafale."""
+        launch, update, context = self._godot_start(monkeypatch, launched=True)
+        update.effective_chat = None
+        handler = StartHandler()
+
+        await handler.handle(update, context)
+        await handler.handle(update, context)
+
+        assert launch.call_count == 2
+        assert "_godot_last_launch" not in context.bot_data
+
+    @pytest.mark.asyncio
+    async def test_godot_failed_launch_not_debounced(self, monkeypatch):
+        """Test qu'un lancement échoué n'active pas le délai anti-rafale."""
+        launch, update, context = self._godot_start(monkeypatch, launched=False)
+        handler = StartHandler()
+
+        await handler.handle(update, context)
+        await handler.handle(update, context)
+
+        assert launch.call_count == 2
+        assert 123456 not in context.bot_data["_godot_last_launch"]
+
 
 class TestHelpHandler:
     """Tests pour le gestionnaire HelpHandler."""
@@ -79,5 +422,151 @@ class TestHelpHandler:
         context.bot.send_message.assert_called_once()
 
 
+class TestChatMemberCache:
+    """Tests pour le cache ChatMemberCache."""
+
+    @pytest.mark.asyncio
+    async def test_get_chat_member_cached(self):
+        """Test qu'un membre déjà récupéré ne rappelle pas l'API."""
+        bot = MagicMock()
+        bot.get_chat_member = AsyncMock(return_value="member")
+        cache = ChatMemberCache()
+
+        assert await cache.get_chat_member(bot, 1, 2) == "member"
+        assert await cache.get_chat_member(bot, 1, 2) == "member"
+
+        bot.get_chat_member.assert_called_once_with(chat_id=1, user_id=2)
+
+    @pytest.mark.asyncio
+    async def test_get_chat_member_expired(self):
+        """Test qu'une entrée expirée est redemandée."""
+        bot = MagicMock()
+        bot.get_chat_member = AsyncMock(return_value="member")
+        cache = ChatMemberCache(maxsize=1, ttl=0)
+
+        await cache.get_chat_member(bot, 1, 2)
+        await cache.get_chat_member(bot, 1, 2)
+
+        assert bot.get_chat_member.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_chat_member_evicted(self):
+        """Test qu'une entrée évincée par une plus récente est redemandée."""
+        bot = MagicMock()
+        bot.get_chat_member = AsyncMock(return_value="member")
+        cache = ChatMemberCache(maxsize=1)
+
+        await cache.get_chat_member(bot, 1, 2)
+        await cache.get_chat_member(bot, 1, 3)
+        await cache.get_chat_member(bot, 1, 2)
+
+        assert bot.get_chat_member.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self):
+        """Test qu'une entrée invalidée est redemandée."""
+        bot = MagicMock()
+        bot.get_chat_member = AsyncMock(return_value="member")
+        cache = ChatMemberCache()
+
+        await cache.get_chat_member(bot, 1, 2)
+        cache.invalidate(1, 2)
+        await cache.get_chat_member(bot, 1, 2)
+
+        assert bot.get_chat_member.call_count == 2
+
+
+class TestExportGodotProject:
+    """Tests pour l'export headless du projet Godot."""
+
+    @staticmethod
+    def _patch_process(monkeypatch, returncode, hangs=False):
+        """Simule create_subprocess_exec ; le processus attend son kill() si hangs."""
+        proc = MagicMock()
+
+        async def wait():
+            if hangs and not proc.kill.called:
+                await asyncio.sleep(60)
+            return -9 if proc.kill.called else returncode
+
+        proc.wait = wait
+        monkeypatch.setattr(
+            "bot.utils.godot_launcher.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=proc),
+        )
+        return proc
+
+    async def _export(self, tmp_path, timeout=None):
+        """Lance un export vers un répertoire temporaire."""
+        return await export_godot_project(
+            "/usr/bin/godot4",
+            "./godot",
+            "Web",
+            str(tmp_path / "build" / "index.html"),
+            timeout=timeout,
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_success(self, monkeypatch, tmp_path):
+        """Test qu'un export terminé avec le code 0 réussit."""
+        proc = self._patch_process(monkeypatch, returncode=0)
+
+        assert await self._export(tmp_path)
+        assert (tmp_path / "build").is_dir()
+        proc.kill.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_export_nonzero_exit(self, monkeypatch, tmp_path):
+        """Test qu'un code de sortie non nul fait échouer l'export."""
+        self._patch_process(monkeypatch, returncode=1)
+
+        assert not await self._export(tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_export_timeout_kills_process(self, monkeypatch, tmp_path):
+        """Test qu'un export trop long est tué."""
+        proc = self._patch_process(monkeypatch, returncode=0, hangs=True)
+
+        assert not await self._export(tmp_path, timeout=0.01)
+        proc.kill.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_export_cancelled_kills_process(self, monkeypatch, tmp_path):
+        """Test que l'annulation de l'attente tue le processus d'export."""
+        proc = self._patch_process(monkeypatch, returncode=0, hangs=True)
+
+        task = asyncio.create_task(self._export(tmp_path))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        proc.kill.assert_called_once()
+
+
+class TestOrjsonRequest:
+    """Tests pour le décodage JSON d'OrjsonRequest."""
+
+    def test_parse_valid_payload(self):
+        """Test le décodage d'une réponse valide."""
+        payload = '{"ok": true, "result": {"text": "é"}}'.encode("utf-8")
+        assert OrjsonRequest.parse_json_payload(payload) == {
+            "ok": True,
+            "result": {"text": "é"},
+        }
+
+    def test_parse_invalid_utf8(self):
+        """Test qu'un UTF-8 invalide est remplacé plutôt que rejeté."""
+        payload = b'{"ok": true, "result": "a\xffb"}'
+        assert OrjsonRequest.parse_json_payload(payload) == {
+            "ok": True,
+            "result": "a\ufffdb",
+        }
+
+    def test_parse_invalid_json(self):
+        """Test qu'un JSON invalide lève une TelegramError."""
+        with pytest.raises(TelegramError):
+            OrjsonRequest.parse_json_payload(b"<html>Bad Gateway</html>")
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,15 @@
+"""
+Fixtures partagées pour les tests.
+"""
+
+import pytest
+
+from bot.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def reinitialiser_settings():
+    """Vide le cache des paramètres autour de chaque test."""
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()